@@ -6,19 +6,30 @@ from homeassistant.components import bluetooth
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_ADDRESS, Platform
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers import config_validation as cv, device_registry as dr
+from homeassistant.helpers.typing import ConfigType
 
 from .const import DOMAIN
 from .coordinator import ATickDataUpdateCoordinator
 from .device import ATickBTDevice
+from .services import async_setup_services
 
 _LOGGER = logging.getLogger(__name__)
 
 PLATFORMS = [Platform.SENSOR]
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
 type ATickConfigEntry = ConfigEntry[ATickDataUpdateCoordinator]
 
 
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the Deembot aTick services."""
+    await async_setup_services(hass)
+
+    return True
+
+
 async def async_setup_entry(hass: HomeAssistant, entry: ATickConfigEntry) -> bool:
     """Set up Deembot aTick from a config entry."""
     assert entry.unique_id is not None
@@ -69,8 +80,8 @@ async def async_setup_entry(hass: HomeAssistant, entry: ATickConfigEntry) -> boo
 
 
 async def _async_update_listener(hass: HomeAssistant, entry: ATickConfigEntry) -> None:
-    """Handle options update."""
-    await hass.config_entries.async_reload(entry.entry_id)
+    """Apply config entry and options updates in place."""
+    entry.runtime_data.async_apply_config(entry)
 
 
 async def async_unload_entry(hass: HomeAssistant, entry: ATickConfigEntry) -> bool:
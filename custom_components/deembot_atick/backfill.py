@@ -0,0 +1,315 @@
+"""Backfill of long-term statistics from captured advertisements.
+
+A capture file is a text file with one advertisement per line::
+
+    # timestamp,address,manufacturer data (hex)
+    2024-05-01T10:15:02+03:00,AA:BB:CC:DD:EE:FF,11f3a2...
+    1714547702.5,AA:BB:CC:DD:EE:FF,11f3a2...
+
+Timestamps are ISO 8601 or Unix epoch seconds, lines are expected in
+chronological order. The file is streamed: only the last reading of the
+current hour is kept per device, and finished hours are imported every
+``BACKFILL_BATCH_SIZE`` hours while reading, so memory stays bounded
+whatever the length of the capture.
+"""
+from __future__ import annotations
+
+import dataclasses
+import itertools
+import logging
+from collections.abc import Callable, Iterator
+from datetime import datetime, timedelta, timezone
+
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.models import StatisticData, StatisticMeanType, StatisticMetaData
+from homeassistant.components.recorder.statistics import (
+    async_import_statistics,
+    get_last_statistics,
+    statistics_during_period,
+)
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import Platform, UnitOfVolume
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import entity_registry as er
+from homeassistant.util import dt as dt_util
+from homeassistant.util.unit_conversion import VolumeConverter
+
+from .const import BACKFILL_BATCH_SIZE, BACKFILL_LOOKBACK_DAYS, DOMAIN
+from .device import ATickParsedAdvertisementData
+
+_LOGGER = logging.getLogger(__name__)
+
+COUNTER_KEYS = ("counter_a_value", "counter_b_value")
+
+
+@dataclasses.dataclass
+class HourlyReading:
+    start: datetime
+    counter_a_value: float
+    counter_b_value: float
+
+
+@dataclasses.dataclass
+class CaptureSummary:
+    lines: int = 0
+    skipped: int = 0
+
+
+def _parse_timestamp(value: str) -> datetime | None:
+    try:
+        return datetime.fromtimestamp(float(value), timezone.utc)
+    except ValueError:
+        pass
+
+    if (parsed := dt_util.parse_datetime(value)) is None:
+        return None
+
+    return dt_util.as_utc(parsed)
+
+
+def iter_capture_hours(
+    path: str,
+    decoders: dict[str, Callable[[bytes], ATickParsedAdvertisementData]],
+    summary: CaptureSummary,
+) -> Iterator[tuple[str, HourlyReading]]:
+    """Decode a capture file, yield each device's hours once they are finished."""
+    current: dict[str, HourlyReading] = {}
+
+    with open(path, encoding="utf-8") as capture:
+        for line in capture:
+            line = line.strip()
+
+            if not line or line.startswith("#"):
+                continue
+
+            summary.lines += 1
+
+            try:
+                timestamp, address, payload = (part.strip() for part in line.split(","))
+                data = bytes.fromhex(payload)
+            except ValueError:
+                summary.skipped += 1
+                continue
+
+            address = address.upper()
+
+            if (decode := decoders.get(address)) is None:
+                continue
+
+            if (when := _parse_timestamp(timestamp)) is None:
+                summary.skipped += 1
+                continue
+
+            parsed = decode(data)
+
+            # Same validity rule as ATickBTDevice.is_advertisement_changed
+            if (parsed.counter_a_value + parsed.counter_b_value) <= 0:
+                summary.skipped += 1
+                continue
+
+            start = when.replace(minute=0, second=0, microsecond=0)
+            bucket = current.get(address)
+
+            if bucket is not None and start < bucket.start:
+                summary.skipped += 1
+                continue
+
+            if bucket is not None and start > bucket.start:
+                yield address, bucket
+
+            current[address] = HourlyReading(start, parsed.counter_a_value, parsed.counter_b_value)
+
+    yield from current.items()
+
+
+def _take(hours: Iterator[tuple[str, HourlyReading]], count: int) -> list[tuple[str, HourlyReading]]:
+    return list(itertools.islice(hours, count))
+
+
+class _StatisticImport:
+    """Running state of the hourly statistics imported for one counter."""
+
+    def __init__(self, hass: HomeAssistant, statistic_id: str) -> None:
+        self._hass = hass
+        self.statistic_id = statistic_id
+        self.imported = 0
+        self._anchored = False
+        self._state: float | None = None
+        self._sum = 0.0
+        # Existing row after the first imported hour the sum counts back from
+        self._ahead: tuple[datetime, float, float] | None = None
+        self._metadata = StatisticMetaData(
+            mean_type=StatisticMeanType.NONE,
+            has_sum=True,
+            name=None,
+            source="recorder",
+            statistic_id=statistic_id,
+            unit_class=VolumeConverter.UNIT_CLASS,
+            unit_of_measurement=UnitOfVolume.CUBIC_METERS,
+        )
+
+    async def _async_rows(self, start: datetime, end: datetime) -> list[tuple[datetime, float, float]]:
+        """Return the existing (start, state, sum) rows of the period."""
+        existing = await get_instance(self._hass).async_add_executor_job(
+            statistics_during_period,
+            self._hass,
+            start,
+            end,
+            {self.statistic_id},
+            "hour",
+            None,
+            {"state", "sum"},
+        )
+
+        return [
+            (dt_util.utc_from_timestamp(row["start"]), row.get("state"), row["sum"])
+            for row in existing.get(self.statistic_id, [])
+            if row.get("sum") is not None
+        ]
+
+    async def _async_anchor(self, first_start: datetime) -> None:
+        """Find the existing statistics the imported sum has to continue."""
+        last = await get_instance(self._hass).async_add_executor_job(
+            get_last_statistics, self._hass, 1, self.statistic_id, False, {"state", "sum"}
+        )
+
+        if not (last_rows := last.get(self.statistic_id)):
+            return
+
+        lookback = timedelta(days=BACKFILL_LOOKBACK_DAYS)
+
+        if dt_util.utc_from_timestamp(last_rows[0]["start"]) < first_start:
+            rows = [(None, last_rows[0].get("state"), last_rows[0].get("sum"))]
+        else:
+            rows = await self._async_rows(first_start - lookback, first_start)
+
+        if rows and rows[-1][2] is not None:
+            _, self._state, self._sum = rows[-1]
+            return
+
+        # Hours are imported in front of existing statistics: count back from them
+        if rows := await self._async_rows(first_start, first_start + lookback):
+            self._ahead = rows[0]
+            return
+
+        raise HomeAssistantError(
+            f"No statistics of {self.statistic_id} within {BACKFILL_LOOKBACK_DAYS} days "
+            f"of {first_start.isoformat()} to continue the sum from"
+        )
+
+    async def async_add(self, hours: list[tuple[datetime, float]]) -> None:
+        """Import a chronological batch of hourly counter states."""
+        if not self._anchored:
+            await self._async_anchor(hours[0][0])
+            self._anchored = True
+
+        # Hours the recorder already compiled stay untouched and anchor the sum
+        existing = {
+            start: (state, total)
+            for start, state, total in await self._async_rows(
+                hours[0][0], hours[-1][0] + timedelta(hours=1)
+            )
+        }
+        statistics: list[StatisticData] = []
+
+        for start, value in hours:
+            if self._ahead is not None and start >= self._ahead[0]:
+                _, self._state, self._sum = self._ahead
+                self._ahead = None
+
+            if start in existing:
+                self._state, self._sum = existing[start]
+                continue
+
+            if self._ahead is not None:
+                _, ahead_state, ahead_sum = self._ahead
+                total = ahead_sum - max(0.0, ahead_state - value)
+            elif self._state is None:
+                total = self._sum
+            elif value >= self._state:
+                total = self._sum + value - self._state
+            else:
+                # A drop means the meter was reset, as for total_increasing sensors
+                total = self._sum + value
+
+            if self._ahead is None:
+                self._state, self._sum = value, total
+
+            statistics.append(StatisticData(start=start, state=value, sum=total))
+
+        if statistics:
+            async_import_statistics(self._hass, self._metadata, statistics)
+            self.imported += len(statistics)
+
+
+async def async_import_capture(
+    hass: HomeAssistant,
+    path: str,
+    addresses: list[str] | None = None,
+) -> dict[str, int | dict[str, int]]:
+    """Import a capture file into the statistics of the counter sensors."""
+    entity_registry = er.async_get(hass)
+    decoders: dict[str, Callable[[bytes], ATickParsedAdvertisementData]] = {}
+    entity_ids: dict[str, dict[str, str]] = {}
+
+    for entry in hass.config_entries.async_entries(DOMAIN):
+        if entry.state is not ConfigEntryState.LOADED:
+            continue
+
+        coordinator = entry.runtime_data
+        device = coordinator.device
+
+        if addresses is not None and device.address not in addresses:
+            continue
+
+        entity_ids[device.address] = {
+            key: entity_id
+            for key in COUNTER_KEYS
+            if (entity_id := entity_registry.async_get_entity_id(
+                Platform.SENSOR, DOMAIN, f"{device.base_unique_id}-{key}"
+            ))
+        }
+        decoders[device.address] = lambda data, device=device, pin=coordinator.pin: (
+            device.parse_manufacturer_data(pin, data)
+        )
+
+    if not decoders:
+        raise HomeAssistantError("No matching aTick devices are loaded")
+
+    summary = CaptureSummary()
+    imports = {
+        statistic_id: _StatisticImport(hass, statistic_id)
+        for counters in entity_ids.values()
+        for statistic_id in counters.values()
+    }
+    hours = iter_capture_hours(path, decoders, summary)
+
+    try:
+        while batch := await hass.async_add_executor_job(_take, hours, BACKFILL_BATCH_SIZE):
+            for address, counters in entity_ids.items():
+                readings = [reading for reading_address, reading in batch if reading_address == address]
+
+                if not readings:
+                    continue
+
+                for key, statistic_id in counters.items():
+                    await imports[statistic_id].async_add(
+                        [(reading.start, getattr(reading, key)) for reading in readings]
+                    )
+    except OSError as ex:
+        raise HomeAssistantError(f"Cannot read capture {path}: {ex}") from ex
+    finally:
+        hours.close()
+
+    imported = {statistic_id: counter.imported for statistic_id, counter in imports.items()}
+
+    _LOGGER.info(
+        "Imported %s hours of statistics from %s lines of %s (%s skipped)",
+        sum(imported.values()),
+        summary.lines,
+        path,
+        summary.skipped,
+    )
+
+    return {"lines": summary.lines, "skipped": summary.skipped, "imported": imported}
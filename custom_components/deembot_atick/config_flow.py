@@ -9,10 +9,21 @@ from bleak import BleakError
 from homeassistant import config_entries
 from homeassistant.components.bluetooth import BluetoothServiceInfoBleak, async_discovered_service_info
 from homeassistant.const import CONF_ADDRESS, CONF_PIN
+from homeassistant.core import callback
 from homeassistant.data_entry_flow import FlowResult
 import homeassistant.helpers.config_validation as cv
 
-from .const import DOMAIN, DEFAULT_PIN_DEVICE
+from .const import (DOMAIN,
+                    DEFAULT_PIN_DEVICE,
+                    ACTIVE_POLL_INTERVAL,
+                    CONF_ACTIVE_POLL_INTERVAL,
+                    CONF_HISTORY,
+                    CONF_HISTORY_RETENTION_DAYS,
+                    HISTORY_RETENTION_DAYS,
+                    CONF_PRESENCE_INTERVAL_FACTOR,
+                    CONF_PRESENCE_MIN_TIMEOUT,
+                    PRESENCE_INTERVAL_FACTOR,
+                    PRESENCE_MIN_TIMEOUT)
 from .device import ATickBTDevice
 
 _LOGGER = logging.getLogger(__name__)
@@ -25,6 +36,12 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         self._discovery_info: BluetoothServiceInfoBleak | None = None
         self._discovered_devices: dict[str, BluetoothServiceInfoBleak] = {}
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: config_entries.ConfigEntry) -> OptionsFlow:
+        """Get the options flow for this handler."""
+        return OptionsFlow()
+
     async def async_step_bluetooth(self, discovery_info: BluetoothServiceInfoBleak) -> FlowResult:
         """Handle the bluetooth discovery step."""
 
@@ -133,6 +150,7 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 errors["base"] = "pin_invalid"
 
             if errors.get("base") is None:
+                # The update listener swaps the PIN in place, no reload needed
                 self.hass.config_entries.async_update_entry(
                     entry,
                     data=entry.data | {
@@ -140,8 +158,7 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                     }
                 )
 
-                if await self.hass.config_entries.async_reload(entry.entry_id):
-                    return self.async_abort(reason="reconfigure_successful")
+                return self.async_abort(reason="reconfigure_successful")
 
         current_value = user_input.get(CONF_PIN) if user_input is not None else ""
 
@@ -152,3 +169,38 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             }),
             errors=errors
         )
+
+
+class OptionsFlow(config_entries.OptionsFlow):
+    async def async_step_init(self, user_input: dict[str, Any] | None = None) -> FlowResult:
+        """Manage the polling and presence options, applied without a reload."""
+        if user_input is not None:
+            return self.async_create_entry(data=user_input)
+
+        options = self.config_entry.options
+
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema({
+                vol.Required(
+                    CONF_ACTIVE_POLL_INTERVAL,
+                    default=options.get(CONF_ACTIVE_POLL_INTERVAL, ACTIVE_POLL_INTERVAL // 3600),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=24 * 30)),
+                vol.Required(
+                    CONF_PRESENCE_INTERVAL_FACTOR,
+                    default=options.get(CONF_PRESENCE_INTERVAL_FACTOR, PRESENCE_INTERVAL_FACTOR),
+                ): vol.All(vol.Coerce(float), vol.Range(min=1, max=100)),
+                vol.Required(
+                    CONF_PRESENCE_MIN_TIMEOUT,
+                    default=options.get(CONF_PRESENCE_MIN_TIMEOUT, PRESENCE_MIN_TIMEOUT),
+                ): vol.All(vol.Coerce(int), vol.Range(min=10, max=24 * 60 * 60)),
+                vol.Required(
+                    CONF_HISTORY,
+                    default=options.get(CONF_HISTORY, False),
+                ): cv.boolean,
+                vol.Required(
+                    CONF_HISTORY_RETENTION_DAYS,
+                    default=options.get(CONF_HISTORY_RETENTION_DAYS, HISTORY_RETENTION_DAYS),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+            }),
+        )
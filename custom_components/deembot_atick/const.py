@@ -3,6 +3,16 @@ DOMAIN = "deembot_atick"
 ACTIVE_POLL_INTERVAL = 60 * 60 * 24
 DEFAULT_PIN_DEVICE = "123456"
 
+CONF_ACTIVE_POLL_INTERVAL = "active_poll_interval"
+CONF_PRESENCE_INTERVAL_FACTOR = "presence_interval_factor"
+CONF_PRESENCE_MIN_TIMEOUT = "presence_min_timeout"
+CONF_HISTORY = "history"
+CONF_HISTORY_RETENTION_DAYS = "history_retention_days"
+
+SOURCE_ADVERTISEMENT = "advertisement"
+SOURCE_ACTIVE = "active"
+SOURCE_RESTORED = "restored"
+
 UUID_SERVICE_AG = "348634B0-EFE4-11E4-B80C-0800200C9A66"
 
 UUID_ATTR_MODEL = "00002A24-0000-1000-8000-00805F9B34FB"
@@ -16,3 +26,13 @@ UUID_AG_ATTR_COUNTERS = "348634B6-EFE4-11E4-B80C-0800200C9A66"
 UUID_AG_ATTR_MODE = "348634B7-EFE4-11E4-B80C-0800200C9A66"
 UUID_AG_ATTR_VALUES = "348634B8-EFE4-11E4-B80C-0800200C9A66"
 UUID_AG_ATTR_RATIOS = "348634B9-EFE4-11E4-B80C-0800200C9A66"
+
+PRESENCE_CHECK_INTERVAL = 30
+PRESENCE_INTERVAL_FACTOR = 3
+PRESENCE_MIN_TIMEOUT = 60
+
+BACKFILL_BATCH_SIZE = 1000
+BACKFILL_LOOKBACK_DAYS = 30
+
+HISTORY_FLUSH_INTERVAL = 60
+HISTORY_RETENTION_DAYS = 5 * 365
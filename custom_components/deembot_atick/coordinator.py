@@ -1,18 +1,61 @@
 from __future__ import annotations
 
 import logging
+import time
+from collections.abc import Mapping
+from datetime import datetime, timedelta
+from typing import Any
+
+from bleak import AdvertisementData
 
 from homeassistant.components import bluetooth
 from homeassistant.components.bluetooth.active_update_coordinator import ActiveBluetoothDataUpdateCoordinator
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_PIN
-from homeassistant.core import CoreState, HomeAssistant, callback
+from homeassistant.core import CALLBACK_TYPE, CoreState, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
 from homeassistant.helpers.update_coordinator import UpdateFailed
+from homeassistant.util.hass_dict import HassKey
 
+from .const import (
+    ACTIVE_POLL_INTERVAL,
+    CONF_ACTIVE_POLL_INTERVAL,
+    CONF_HISTORY,
+    CONF_HISTORY_RETENTION_DAYS,
+    CONF_PRESENCE_INTERVAL_FACTOR,
+    CONF_PRESENCE_MIN_TIMEOUT,
+    DOMAIN,
+    HISTORY_FLUSH_INTERVAL,
+    HISTORY_RETENTION_DAYS,
+    PRESENCE_CHECK_INTERVAL,
+    PRESENCE_INTERVAL_FACTOR,
+    PRESENCE_MIN_TIMEOUT,
+)
 from .device import ATickBTDevice
+from .history import HistoryStore
+from .presence import AdvertisementPresence
+from .profiler import profiled
 
 _LOGGER = logging.getLogger(__name__)
 
+# Stores outlive the coordinators, so a flush still running in the executor
+# for a replaced coordinator holds the same lock as the next one
+DATA_HISTORY_STORES: HassKey[dict[str, HistoryStore]] = HassKey(f"{DOMAIN}_history_stores")
+
+
+@callback
+def _async_get_history_store(hass: HomeAssistant, address: str, retention_days: int) -> HistoryStore:
+    """Return the single history store of a device."""
+    stores = hass.data.setdefault(DATA_HISTORY_STORES, {})
+    path = hass.config.path(DOMAIN, "history", address.replace(":", "").lower())
+
+    if (store := stores.get(path)) is None:
+        store = stores[path] = HistoryStore(path, retention_days)
+    else:
+        store.retention_days = retention_days
+
+    return store
+
 
 class ATickDataUpdateCoordinator(ActiveBluetoothDataUpdateCoordinator[None]):
     """Bluetooth coordinator for aTick devices."""
@@ -39,13 +82,128 @@ class ATickDataUpdateCoordinator(ActiveBluetoothDataUpdateCoordinator[None]):
         self._config = entry.data
         self._device_seen = device_seen
         self._was_unavailable = not device_seen
+        self._presence_stale = False
+        self._last_advertisement: AdvertisementData | None = None
+        self.presence = AdvertisementPresence()
+        self._apply_options(entry.options)
 
     @property
     def device_seen(self) -> bool:
         """Return whether the device is currently known to the Bluetooth stack."""
         return self._device_seen
 
+    @property
+    def pin(self) -> str:
+        """Return the PIN the advertisements are encrypted with."""
+        return self._config[CONF_PIN]
+
+    def _apply_options(self, options: Mapping[str, Any]) -> None:
+        self.device.active_poll_interval = (
+            options.get(CONF_ACTIVE_POLL_INTERVAL, ACTIVE_POLL_INTERVAL // 3600) * 3600
+        )
+        self.presence.factor = options.get(CONF_PRESENCE_INTERVAL_FACTOR, PRESENCE_INTERVAL_FACTOR)
+        self.presence.min_timeout = options.get(CONF_PRESENCE_MIN_TIMEOUT, PRESENCE_MIN_TIMEOUT)
+
+        retention_days = options.get(CONF_HISTORY_RETENTION_DAYS, HISTORY_RETENTION_DAYS)
+
+        if not options.get(CONF_HISTORY, False):
+            if (history := self.device.history) is not None:
+                self.device.history = None
+                self.hass.async_add_executor_job(history.flush)
+        else:
+            self.device.history = _async_get_history_store(self.hass, self.address, retention_days)
+
+    @callback
+    def async_apply_config(self, entry: ConfigEntry) -> None:
+        """Apply an updated config entry without reloading it."""
+        pin_changed = entry.data.get(CONF_PIN) != self.pin
+
+        self._config = entry.data
+        self._apply_options(entry.options)
+
+        if pin_changed and self._last_advertisement is not None:
+            parsed_adv = self.device.parse_advertisement_data(self.pin, self._last_advertisement)
+
+            _LOGGER.debug("%s: advertisement data with new PIN: %s", self.address, parsed_adv)
+
+            if parsed_adv is not None and self.device.is_advertisement_changed(parsed_adv):
+                self.device.update_from_advertisement(parsed_adv)
+
+        self.async_update_listeners()
+
+    @callback
+    def async_start(self) -> CALLBACK_TYPE:
+        """Start the coordinator and the adaptive presence check."""
+        unsub_coordinator = super().async_start()
+        unsub_presence = async_track_time_interval(
+            self.hass,
+            self._async_check_presence,
+            timedelta(seconds=PRESENCE_CHECK_INTERVAL),
+        )
+        unsub_history = async_track_time_interval(
+            self.hass,
+            self._async_flush_history,
+            timedelta(seconds=HISTORY_FLUSH_INTERVAL),
+        )
+
+        @callback
+        def _async_stop() -> None:
+            unsub_history()
+            unsub_presence()
+            unsub_coordinator()
+
+            if (history := self.device.history) is not None:
+                self.hass.async_add_executor_job(history.flush)
+
+        return _async_stop
+
+    async def _async_flush_history(self, now: datetime) -> None:
+        """Write buffered counter changes and apply the retention period."""
+        if (history := self.device.history) is None:
+            return
+
+        def _flush() -> None:
+            history.flush()
+            history.compact(time.time())
+
+        try:
+            await self.hass.async_add_executor_job(_flush)
+        except OSError:
+            _LOGGER.exception("%s: cannot write counter history", self.address)
+
+    @callback
+    def _async_check_presence(self, now: datetime) -> None:
+        """Mark the device unavailable once it is silent for longer than usual."""
+        # Repeated advertisements are not dispatched to callbacks, but they
+        # refresh the cache and the interval the Bluetooth integration learns
+        if service_info := bluetooth.async_last_service_info(self.hass, self.address, False):
+            self.presence.touch(service_info.time)
+
+        self.presence.interval = bluetooth.async_get_learned_advertising_interval(
+            self.hass, self.address
+        )
+
+        now_monotonic = bluetooth.MONOTONIC_TIME()
+        stale = self.presence.is_stale(now_monotonic)
+
+        if stale and self._device_seen:
+            _LOGGER.debug(
+                "%s: no advertisement for %.0fs (expected every %.1fs)",
+                self.address,
+                self.presence.gap(now_monotonic),
+                self.presence.interval,
+            )
+            self._device_seen = False
+            self._was_unavailable = True
+            self._presence_stale = True
+            self.async_update_listeners()
+        elif not stale and self._presence_stale:
+            self._device_seen = True
+            self._presence_stale = False
+            self.async_update_listeners()
+
     @callback
+    @profiled
     def _needs_poll(
         self,
         service_info: bluetooth.BluetoothServiceInfoBleak,
@@ -64,6 +222,7 @@ class ATickDataUpdateCoordinator(ActiveBluetoothDataUpdateCoordinator[None]):
         _LOGGER.debug("%s: needs active BLE poll: %s", self.address, is_needed)
         return is_needed
 
+    @profiled
     async def _async_update(
         self, service_info: bluetooth.BluetoothServiceInfoBleak
     ) -> None:
@@ -82,11 +241,13 @@ class ATickDataUpdateCoordinator(ActiveBluetoothDataUpdateCoordinator[None]):
     ) -> None:
         """Handle the device going unavailable."""
         self._device_seen = False
+        self._presence_stale = False
         self._was_unavailable = True
         _LOGGER.debug("%s: Bluetooth device is unavailable", self.address)
         super()._async_handle_unavailable(service_info)
 
     @callback
+    @profiled
     def _async_handle_bluetooth_event(
         self,
         service_info: bluetooth.BluetoothServiceInfoBleak,
@@ -94,10 +255,12 @@ class ATickDataUpdateCoordinator(ActiveBluetoothDataUpdateCoordinator[None]):
     ) -> None:
         """Handle a Bluetooth event."""
         self._device_seen = True
+        self._presence_stale = False
         self.device.set_ble_device(service_info.device)
+        self._last_advertisement = service_info.advertisement
 
         parsed_adv = self.device.parse_advertisement_data(
-            self._config[CONF_PIN], service_info.advertisement
+            self.pin, service_info.advertisement
         )
 
         _LOGGER.debug("%s: advertisement raw data: %s", self.address, service_info.advertisement)
@@ -3,9 +3,10 @@ import asyncio
 import dataclasses
 import logging
 import time
+from datetime import datetime, timezone
 from contextlib import AsyncExitStack
 from textwrap import wrap
-from typing import Any
+from typing import Any, Callable
 
 from bleak import BleakClient, BLEDevice, AdvertisementData
 from bleak.exc import BleakError
@@ -17,7 +18,12 @@ from .const import (UUID_ATTR_VERSION_FIRMWARE,
                     UUID_AG_ATTR_RATIOS,
                     DEFAULT_PIN_DEVICE,
                     ACTIVE_POLL_INTERVAL,
+                    SOURCE_ACTIVE,
+                    SOURCE_ADVERTISEMENT,
+                    SOURCE_RESTORED,
                     UUID_ATTR_MODEL)
+from .history import HistoryStore
+from .profiler import profiled
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -35,15 +41,21 @@ class ATickBTDevice:
         name: str | None = None,
         ble_device: BLEDevice | None = None,
         device_info: dict[str, Any] | None = None,
+        client_factory: Callable[..., BleakClient] = BleakClient,
     ) -> None:
         self._last_active_update = -ACTIVE_POLL_INTERVAL
+        self.active_poll_interval = ACTIVE_POLL_INTERVAL
         self._address = address.upper()
         self._name = name or self._address
         self._ble_device = ble_device
         self.base_unique_id = self._address
         self._client: BleakClient | None = None
+        self._client_factory = client_factory
         self._client_stack = AsyncExitStack()
         self._lock = asyncio.Lock()
+        self.last_updated: datetime | None = None
+        self.last_source: str | None = None
+        self.history: HistoryStore | None = None
 
         device_info = device_info or {}
         self.data: dict[str, str | int | float | None] = {
@@ -68,10 +80,10 @@ class ATickBTDevice:
         self.base_unique_id = self._address
 
     def active_poll_needed(self, seconds_since_last_poll: float | None) -> bool:
-        if seconds_since_last_poll is not None and seconds_since_last_poll < ACTIVE_POLL_INTERVAL:
+        if seconds_since_last_poll is not None and seconds_since_last_poll < self.active_poll_interval:
             return False
 
-        return (time.monotonic() - self._last_active_update) > ACTIVE_POLL_INTERVAL
+        return (time.monotonic() - self._last_active_update) > self.active_poll_interval
 
     async def active_full_update(self):
         try:
@@ -93,16 +105,23 @@ class ATickBTDevice:
 
         _LOGGER.debug('device info active update')
 
+    @profiled
     def parse_advertisement_data(self, pin: None | str, adv: AdvertisementData) -> ATickParsedAdvertisementData | None:
         # Может и не быть
         if not adv.manufacturer_data:
             return None
 
+        return self.parse_manufacturer_data(
+            pin,
+            adv.manufacturer_data.get(list(adv.manufacturer_data.keys())[-1])
+        )
+
+    def parse_manufacturer_data(self, pin: None | str, data: bytes) -> ATickParsedAdvertisementData:
         new_values = (0, 0)
 
         try:
             new_values = self.parseAdvValuesCounters(
-                adv.manufacturer_data.get(list(adv.manufacturer_data.keys())[-1]),
+                data,
                 pin or DEFAULT_PIN_DEVICE,
                 self._address
             )
@@ -114,6 +133,7 @@ class ATickBTDevice:
             counter_b_value=new_values[1]
         )
 
+    @profiled
     def is_advertisement_changed(self, parsed_advertisement: ATickParsedAdvertisementData) -> bool:
         return (
                 ((parsed_advertisement.counter_a_value + parsed_advertisement.counter_b_value) > 0)
@@ -121,12 +141,48 @@ class ATickBTDevice:
                      or parsed_advertisement.counter_b_value != self.data['counter_b_value'])
                 )
 
+    @profiled
     def update_from_advertisement(self, parsed_advertisement: ATickParsedAdvertisementData):
-        self.data['counter_a_value'] = parsed_advertisement.counter_a_value
-        self.data['counter_b_value'] = parsed_advertisement.counter_b_value
+        changed = self._set_counters(
+            parsed_advertisement.counter_a_value,
+            parsed_advertisement.counter_b_value,
+            SOURCE_ADVERTISEMENT,
+        )
+
+        if changed and self.history is not None:
+            self.history.append(
+                self.last_updated.timestamp(),
+                parsed_advertisement.counter_a_value,
+                parsed_advertisement.counter_b_value,
+            )
 
         _LOGGER.debug('update from advertisement')
 
+    def restore_counter_value(self, key: str, value: float, updated: datetime) -> None:
+        self.data[key] = value
+
+        if self.last_updated is None or updated > self.last_updated:
+            self.last_updated = updated
+            self.last_source = SOURCE_RESTORED
+
+    def _set_counters(self, counter_a_value: float, counter_b_value: float, source: str) -> bool:
+        """Store the counters, return whether they changed."""
+        changed = (
+            counter_a_value != self.data['counter_a_value']
+            or counter_b_value != self.data['counter_b_value']
+        )
+
+        self.data['counter_a_value'] = counter_a_value
+        self.data['counter_b_value'] = counter_b_value
+
+        # Re-applying the same reading, e.g. after the device was unavailable,
+        # is not a change for the readings export cursor
+        if changed:
+            self.last_updated = datetime.now(timezone.utc)
+            self.last_source = source
+
+        return changed
+
     async def stop(self) -> None:
         if self._client is None:
             return
@@ -154,7 +210,7 @@ class ATickBTDevice:
 
                 try:
                     self._client = await self._client_stack.enter_async_context(
-                        BleakClient(self._ble_device, timeout=15)
+                        self._client_factory(self._ble_device, timeout=15)
                     )
                 except asyncio.TimeoutError as exc:
                     _LOGGER.debug("Timeout on connect", exc_info=True)
@@ -195,8 +251,11 @@ class ATickBTDevice:
     async def update_counters_value(self):
         if data := await self.read_gatt(UUID_AG_ATTR_VALUES):
             values = array.array('f', data).tolist()
-            self.data['counter_a_value'] = self.truncate_float(values[0], 2)
-            self.data['counter_b_value'] = self.truncate_float(values[1], 2)
+            self._set_counters(
+                self.truncate_float(values[0], 2),
+                self.truncate_float(values[1], 2),
+                SOURCE_ACTIVE,
+            )
 
     async def update_counters_ratio(self):
         if data := await self.read_gatt(UUID_AG_ATTR_RATIOS):
@@ -0,0 +1,202 @@
+"""Append-only high resolution counter history.
+
+Every counter change is stored as a fixed width record (timestamp as a
+double, counter A and B as float32, the precision the device advertises)
+in segment files of ``SEGMENT_RECORDS`` records. Segments are named after
+their first timestamp and read through ``mmap``, so a range query is a
+binary search over the records without parsing the files.
+
+``append`` only buffers the record and is safe to call from the event
+loop, ``flush``, ``compact`` and ``query`` do file I/O and belong in the
+executor.
+"""
+from __future__ import annotations
+
+import bisect
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+
+_LOGGER = logging.getLogger(__name__)
+
+RECORD = struct.Struct('<dff')
+SEGMENT_RECORDS = 65536
+SEGMENT_SUFFIX = '.seg'
+
+
+class _SegmentTimestamps:
+    """Sequence view of the record timestamps of a mapped segment."""
+
+    def __init__(self, buffer: mmap.mmap, count: int) -> None:
+        self._buffer = buffer
+        self._count = count
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index: int) -> float:
+        return struct.unpack_from('<d', self._buffer, index * RECORD.size)[0]
+
+
+class HistoryStore:
+    def __init__(self, path: str, retention_days: int) -> None:
+        self.path = path
+        self.retention_days = retention_days
+        self._pending: list[tuple[float, float, float]] = []
+        self._last_timestamp: float | None = None
+        # Guards the segment files, held during file I/O
+        self._lock = threading.Lock()
+        # Guards only the buffer, so append never waits for file I/O
+        self._pending_lock = threading.Lock()
+
+    def append(self, timestamp: float, counter_a_value: float | None, counter_b_value: float | None) -> None:
+        record = (
+            timestamp,
+            counter_a_value if counter_a_value is not None else float('nan'),
+            counter_b_value if counter_b_value is not None else float('nan'),
+        )
+
+        with self._pending_lock:
+            self._pending.append(record)
+
+    def _segments(self) -> list[tuple[float, str]]:
+        try:
+            names = os.listdir(self.path)
+        except FileNotFoundError:
+            return []
+
+        segments = []
+
+        for name in names:
+            if not name.endswith(SEGMENT_SUFFIX):
+                continue
+
+            try:
+                segments.append((int(name[:-len(SEGMENT_SUFFIX)]) / 1000, os.path.join(self.path, name)))
+            except ValueError:
+                continue
+
+        return sorted(segments)
+
+    def _segment_path(self, first_timestamp: float) -> str:
+        return os.path.join(self.path, f"{int(first_timestamp * 1000):015d}{SEGMENT_SUFFIX}")
+
+    @staticmethod
+    def _read_records(path: str) -> list[tuple[float, float, float]]:
+        with open(path, 'rb') as segment:
+            data = segment.read()
+
+        return list(RECORD.iter_unpack(data[:len(data) - len(data) % RECORD.size]))
+
+    def flush(self) -> int:
+        """Write the buffered records, return how many were stored."""
+        # Swap the buffer first, append keeps working on a fresh list
+        with self._pending_lock:
+            pending, self._pending = self._pending, []
+
+        if not pending:
+            return 0
+
+        with self._lock:
+            os.makedirs(self.path, exist_ok=True)
+            segments = self._segments()
+            current = segments[-1][1] if segments else None
+            count = 0
+
+            if current is not None:
+                size = os.path.getsize(current)
+
+                # Drop a record torn by an interrupted write
+                if size % RECORD.size:
+                    size -= size % RECORD.size
+                    os.truncate(current, size)
+
+                count = size // RECORD.size
+
+                if self._last_timestamp is None and count:
+                    self._last_timestamp = self._read_records(current)[-1][0]
+
+            written = 0
+            segment = open(current, 'ab') if current is not None else None
+
+            try:
+                for record in pending:
+                    # Queries rely on the records being ordered in time
+                    if self._last_timestamp is not None and record[0] <= self._last_timestamp:
+                        continue
+
+                    if segment is None or count >= SEGMENT_RECORDS:
+                        if segment is not None:
+                            segment.close()
+
+                        segment = open(self._segment_path(record[0]), 'ab')
+                        count = 0
+
+                    segment.write(RECORD.pack(*record))
+                    self._last_timestamp = record[0]
+                    count += 1
+                    written += 1
+            finally:
+                if segment is not None:
+                    segment.close()
+
+        return written
+
+    def compact(self, now: float) -> None:
+        """Delete the segments that only hold records older than the retention period.
+
+        Segments are never rewritten, the expired head of the oldest segment
+        stays on disk until the whole segment expires and is hidden by
+        ``query``.
+        """
+        cutoff = self._cutoff(now)
+
+        with self._lock:
+            segments = self._segments()
+
+            # The next segment starting before the cutoff means all records expired
+            while len(segments) > 1 and segments[1][0] <= cutoff:
+                _, path = segments.pop(0)
+                os.remove(path)
+
+                _LOGGER.debug("Removed expired history segment %s", path)
+
+    def _cutoff(self, now: float) -> float:
+        return now - self.retention_days * 24 * 60 * 60
+
+    def query(self, start: float, end: float, limit: int | None = None) -> list[tuple[float, float, float]]:
+        """Return the stored records with ``start <= timestamp < end``."""
+        start = max(start, self._cutoff(time.time()))
+        records: list[tuple[float, float, float]] = []
+
+        with self._lock:
+            segments = self._segments()
+
+            for index, (first_timestamp, path) in enumerate(segments):
+                if first_timestamp >= end:
+                    break
+
+                if index + 1 < len(segments) and segments[index + 1][0] <= start:
+                    continue
+
+                with open(path, 'rb') as segment:
+                    count = os.fstat(segment.fileno()).st_size // RECORD.size
+
+                    if not count:
+                        continue
+
+                    with mmap.mmap(segment.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                        timestamps = _SegmentTimestamps(buffer, count)
+                        lower = bisect.bisect_left(timestamps, start)
+                        upper = bisect.bisect_left(timestamps, end, lower)
+
+                        for position in range(lower, upper):
+                            records.append(RECORD.unpack_from(buffer, position * RECORD.size))
+
+                            if limit is not None and len(records) >= limit:
+                                return records
+
+        return records
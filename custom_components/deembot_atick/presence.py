@@ -0,0 +1,53 @@
+"""Adaptive presence tracking from a device's advertisement interval."""
+from __future__ import annotations
+
+from .const import PRESENCE_INTERVAL_FACTOR, PRESENCE_MIN_TIMEOUT
+
+
+class AdvertisementPresence:
+    """Presence of a device judged against its own advertisement interval.
+
+    The interval is the one the Bluetooth integration learns from every
+    received advertisement. Callbacks cannot measure it: an advertisement
+    identical to the previous one, the common case for a meter whose
+    counters did not move, is never dispatched to them. The device is
+    considered stale once the gap since it was last seen exceeds a
+    multiple of that interval.
+    """
+
+    def __init__(
+        self,
+        factor: float = PRESENCE_INTERVAL_FACTOR,
+        min_timeout: float = PRESENCE_MIN_TIMEOUT,
+    ) -> None:
+        self.factor = factor
+        self.min_timeout = min_timeout
+
+        self.interval: float | None = None
+        self.last_seen: float | None = None
+
+    @property
+    def timeout(self) -> float | None:
+        """Return the gap after which the device is considered stale."""
+        if self.interval is None:
+            return None
+
+        return max(self.min_timeout, self.factor * self.interval)
+
+    def touch(self, timestamp: float) -> None:
+        """Record that the device was seen at the monotonic ``timestamp``."""
+        if self.last_seen is None or timestamp > self.last_seen:
+            self.last_seen = timestamp
+
+    def gap(self, now: float) -> float | None:
+        """Return the seconds since the last advertisement."""
+        if self.last_seen is None:
+            return None
+
+        return max(0.0, now - self.last_seen)
+
+    def is_stale(self, now: float) -> bool:
+        timeout = self.timeout
+        gap = self.gap(now)
+
+        return timeout is not None and gap is not None and gap > timeout
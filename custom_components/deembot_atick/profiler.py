@@ -0,0 +1,144 @@
+"""Scoped cProfile session for the integration's Bluetooth callbacks.
+
+Only calls wrapped with ``profiled`` are recorded, so the resulting stats
+attribute event loop CPU time to this integration rather than to the whole
+Home Assistant process. Coroutines are profiled one step at a time, time
+spent awaiting other tasks is not counted.
+"""
+from __future__ import annotations
+
+import cProfile
+import functools
+import inspect
+import logging
+import types
+from typing import Any, Callable, Coroutine, Generator, TypeVar
+
+_LOGGER = logging.getLogger(__name__)
+
+_T = TypeVar("_T")
+
+_session: ProfileSession | None = None
+
+
+class ProfileSession:
+    def __init__(self) -> None:
+        self.profile = cProfile.Profile()
+        self.calls = 0
+        self._depth = 0
+        self._failed = False
+        self.closed = False
+
+    def _enter(self) -> bool:
+        # Callers still running after stop() must not touch the profile,
+        # it may be dumped from an executor thread
+        if self.closed:
+            return False
+
+        if self._depth == 0:
+            try:
+                self.profile.enable()
+            except ValueError:
+                # Another profiler (e.g. the profiler integration) is active
+                if not self._failed:
+                    _LOGGER.warning("Cannot enable profiling, another profiler is active")
+                    self._failed = True
+                return False
+
+        self._depth += 1
+        self.calls += 1
+
+        return True
+
+    def _exit(self) -> None:
+        self._depth -= 1
+
+        if self._depth == 0:
+            self.profile.disable()
+
+    def run(self, func: Callable[..., _T], *args: Any, **kwargs: Any) -> _T:
+        if not self._enter():
+            return func(*args, **kwargs)
+
+        try:
+            return func(*args, **kwargs)
+        finally:
+            self._exit()
+
+    @types.coroutine
+    def run_coroutine(self, coro: Coroutine[Any, Any, _T]) -> Generator[Any, Any, _T]:
+        """Drive ``coro`` like ``await`` would, profiling only its own steps."""
+        send_value: Any = None
+        throw_value: BaseException | None = None
+
+        while True:
+            entered = self._enter()
+
+            try:
+                if throw_value is not None:
+                    yielded = coro.throw(throw_value)
+                else:
+                    yielded = coro.send(send_value)
+            except StopIteration as stop:
+                return stop.value
+            finally:
+                if entered:
+                    self._exit()
+
+            try:
+                send_value = yield yielded
+                throw_value = None
+            except BaseException as ex:  # noqa: BLE001 - forwarded into the coroutine
+                send_value = None
+                throw_value = ex
+
+    def dump(self, path: str) -> None:
+        self.profile.dump_stats(path)
+
+
+def start() -> ProfileSession:
+    global _session
+
+    if _session is not None:
+        raise RuntimeError("Profiling is already running")
+
+    _session = ProfileSession()
+
+    return _session
+
+
+def stop() -> ProfileSession | None:
+    global _session
+
+    session, _session = _session, None
+
+    if session is not None:
+        session.closed = True
+
+    return session
+
+
+def is_running() -> bool:
+    return _session is not None
+
+
+def profiled(func: Callable[..., Any]) -> Callable[..., Any]:
+    """Record calls of ``func`` while a profile session is running."""
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+            if _session is None:
+                return await func(*args, **kwargs)
+
+            return await _session.run_coroutine(func(*args, **kwargs))
+
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        if _session is None:
+            return func(*args, **kwargs)
+
+        return _session.run(func, *args, **kwargs)
+
+    return wrapper
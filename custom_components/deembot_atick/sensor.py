@@ -1,8 +1,9 @@
 from __future__ import annotations
 
 import logging
+from datetime import timedelta
 
-from homeassistant.components.bluetooth import async_last_service_info
+from homeassistant.components.bluetooth import MONOTONIC_TIME, async_last_service_info
 from homeassistant.components.sensor import (
     SensorDeviceClass,
     SensorEntity,
@@ -13,6 +14,7 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (
     EntityCategory,
     SIGNAL_STRENGTH_DECIBELS_MILLIWATT,
+    UnitOfTime,
     UnitOfVolume,
 )
 from homeassistant.core import HomeAssistant
@@ -21,11 +23,16 @@ from homeassistant.helpers.restore_state import RestoreEntity
 
 from . import ATickDataUpdateCoordinator
 from .base_entity import BaseEntity
+from .const import PRESENCE_CHECK_INTERVAL
 
 _LOGGER = logging.getLogger(__name__)
 
+SCAN_INTERVAL = timedelta(seconds=PRESENCE_CHECK_INTERVAL)
+
 TYPE_COUNTER_A = "counter_a_value"
 TYPE_COUNTER_B = "counter_b_value"
+TYPE_ADVERTISEMENT_INTERVAL = "advertisement_interval"
+TYPE_ADVERTISEMENT_GAP = "advertisement_gap"
 
 ENTITIES: list[SensorEntityDescription] = [
     SensorEntityDescription(
@@ -46,6 +53,29 @@ ENTITIES: list[SensorEntityDescription] = [
     ),
 ]
 
+PRESENCE_ENTITIES: list[SensorEntityDescription] = [
+    SensorEntityDescription(
+        key=TYPE_ADVERTISEMENT_INTERVAL,
+        translation_key=TYPE_ADVERTISEMENT_INTERVAL,
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+        entity_registry_enabled_default=False,
+        entity_category=EntityCategory.DIAGNOSTIC,
+    ),
+    SensorEntityDescription(
+        key=TYPE_ADVERTISEMENT_GAP,
+        translation_key=TYPE_ADVERTISEMENT_GAP,
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=0,
+        entity_registry_enabled_default=False,
+        entity_category=EntityCategory.DIAGNOSTIC,
+    ),
+]
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -57,6 +87,7 @@ async def async_setup_entry(
 
     sensors: list[SensorEntity] = [ATickRSSISensor(coordinator)]
     sensors.extend(ATickWaterCounterSensor(coordinator, description) for description in ENTITIES)
+    sensors.extend(ATickPresenceSensor(coordinator, description) for description in PRESENCE_ENTITIES)
 
     async_add_entities(sensors)
 
@@ -91,7 +122,11 @@ class ATickWaterCounterSensor(BaseEntity, SensorEntity, RestoreEntity):
             last_state = await self.async_get_last_state()
             if last_state is not None and last_state.state not in {"unknown", "unavailable"}:
                 try:
-                    self._device.data[self.entity_description.key] = float(last_state.state)
+                    self._device.restore_counter_value(
+                        self.entity_description.key,
+                        float(last_state.state),
+                        last_state.last_changed,
+                    )
                 except ValueError:
                     _LOGGER.debug(
                         "Cannot restore %s from state %r",
@@ -134,3 +169,37 @@ class ATickRSSISensor(BaseEntity, SensorEntity):
             return service_info.rssi
 
         return None
+
+
+class ATickPresenceSensor(BaseEntity, SensorEntity):
+    """Advertisement interval diagnostic sensor."""
+
+    # Refreshed on its own schedule, the gap grows without any advertisement
+    _attr_should_poll = True
+
+    def __init__(
+        self,
+        coordinator: ATickDataUpdateCoordinator,
+        sensor_description: SensorEntityDescription,
+    ) -> None:
+        super().__init__(coordinator)
+
+        self.entity_description = sensor_description
+
+        self._attr_unique_id = f"{self._device.base_unique_id}-{self.entity_description.key}"
+        self._attr_translation_key = self.entity_description.translation_key
+
+    @property
+    def available(self) -> bool:
+        """Stay available, the gap matters most while the device is silent."""
+        return True
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the expected advertisement interval or the current gap."""
+        presence = self.coordinator.presence
+
+        if self.entity_description.key == TYPE_ADVERTISEMENT_INTERVAL:
+            return presence.interval
+
+        return presence.gap(MONOTONIC_TIME())
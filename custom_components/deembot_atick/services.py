@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import os
+import time
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.components import bluetooth
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import CONF_ADDRESS, CONF_PATH
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse, callback
+from homeassistant.exceptions import HomeAssistantError
+import homeassistant.helpers.config_validation as cv
+from homeassistant.util import dt as dt_util
+
+from . import profiler
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+SERVICE_PROFILE = "profile"
+SERVICE_GET_READINGS = "get_readings"
+SERVICE_IMPORT_HISTORY = "import_history"
+SERVICE_GET_HISTORY = "get_history"
+
+CONF_DURATION = "duration"
+CONF_CHANGED_SINCE = "changed_since"
+CONF_START = "start"
+CONF_END = "end"
+CONF_LIMIT = "limit"
+
+PROFILE_SCHEMA = vol.Schema({
+    vol.Optional(CONF_DURATION, default=60): vol.All(vol.Coerce(float), vol.Range(min=1, max=3600)),
+})
+
+GET_READINGS_SCHEMA = vol.Schema({
+    vol.Optional(CONF_ADDRESS): vol.All(cv.ensure_list, [vol.All(cv.string, vol.Upper)]),
+    vol.Optional(CONF_CHANGED_SINCE): cv.datetime,
+})
+
+
+IMPORT_HISTORY_SCHEMA = vol.Schema({
+    vol.Required(CONF_PATH): cv.string,
+    vol.Optional(CONF_ADDRESS): vol.All(cv.ensure_list, [vol.All(cv.string, vol.Upper)]),
+})
+
+
+GET_HISTORY_SCHEMA = vol.Schema({
+    vol.Required(CONF_ADDRESS): vol.All(cv.string, vol.Upper),
+    vol.Optional(CONF_START): cv.datetime,
+    vol.Optional(CONF_END): cv.datetime,
+    vol.Optional(CONF_LIMIT, default=10000): vol.All(vol.Coerce(int), vol.Range(min=1)),
+})
+
+
+async def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the integration services."""
+
+    async def async_profile(call: ServiceCall) -> ServiceResponse:
+        """Profile the integration callbacks for a fixed duration."""
+        try:
+            session = profiler.start()
+        except RuntimeError as ex:
+            raise HomeAssistantError(str(ex)) from ex
+
+        _LOGGER.info("Profiling Bluetooth callbacks for %s seconds", call.data[CONF_DURATION])
+
+        try:
+            await asyncio.sleep(call.data[CONF_DURATION])
+        finally:
+            profiler.stop()
+
+        path = hass.config.path(f"{DOMAIN}_profile.{int(time.time())}.prof")
+        await hass.async_add_executor_job(session.dump, path)
+
+        _LOGGER.info("Profile of %s calls written to %s", session.calls, path)
+
+        return {"path": path, "calls": session.calls}
+
+    @callback
+    def async_get_readings(call: ServiceCall) -> ServiceResponse:
+        """Return a snapshot of all meter readings."""
+        addresses = call.data.get(CONF_ADDRESS)
+        changed_since = call.data.get(CONF_CHANGED_SINCE)
+
+        if changed_since is not None:
+            changed_since = dt_util.as_utc(changed_since)
+
+        # Runs in a single event loop callback, so the snapshot is consistent
+        cursor = dt_util.utcnow()
+        devices: list[dict[str, Any]] = []
+
+        for entry in hass.config_entries.async_entries(DOMAIN):
+            if entry.state is not ConfigEntryState.LOADED:
+                continue
+
+            coordinator = entry.runtime_data
+            device = coordinator.device
+
+            if addresses is not None and device.address not in addresses:
+                continue
+
+            if changed_since is not None and (
+                device.last_updated is None or device.last_updated <= changed_since
+            ):
+                continue
+
+            service_info = bluetooth.async_last_service_info(hass, device.address, False)
+
+            devices.append({
+                "entry_id": entry.entry_id,
+                "address": device.address,
+                "name": entry.title,
+                "counter_a_value": device.counter_a_value,
+                "counter_b_value": device.counter_b_value,
+                "updated": device.last_updated.isoformat() if device.last_updated else None,
+                "source": device.last_source,
+                "rssi": service_info.rssi if service_info else None,
+                "available": coordinator.available and coordinator.device_seen,
+            })
+
+        return {"cursor": cursor.isoformat(), "devices": devices}
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_READINGS,
+        async_get_readings,
+        schema=GET_READINGS_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    async def async_import_history(call: ServiceCall) -> ServiceResponse:
+        """Backfill counter statistics from an advertisement capture."""
+        if "recorder" not in hass.config.components:
+            raise HomeAssistantError("Importing history requires the recorder")
+
+        try:
+            # The statistics API it builds on is only available in recent versions
+            from .backfill import async_import_capture
+        except ImportError as ex:
+            raise HomeAssistantError("Importing history requires Home Assistant 2025.11 or newer") from ex
+
+        path = hass.config.path(call.data[CONF_PATH])
+
+        def _is_accessible() -> bool:
+            return hass.config.is_allowed_path(path) and os.path.isfile(path)
+
+        if not await hass.async_add_executor_job(_is_accessible):
+            raise HomeAssistantError(f"Capture file {path} is not accessible")
+
+        return await async_import_capture(hass, path, call.data.get(CONF_ADDRESS))
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_IMPORT_HISTORY,
+        async_import_history,
+        schema=IMPORT_HISTORY_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    async def async_get_history(call: ServiceCall) -> ServiceResponse:
+        """Return the stored counter changes of a device."""
+        address = call.data[CONF_ADDRESS]
+        start = call.data.get(CONF_START)
+        end = call.data.get(CONF_END)
+
+        coordinator = next(
+            (
+                entry.runtime_data
+                for entry in hass.config_entries.async_entries(DOMAIN)
+                if entry.state is ConfigEntryState.LOADED
+                and entry.runtime_data.device.address == address
+            ),
+            None,
+        )
+
+        if coordinator is None:
+            raise HomeAssistantError(f"aTick device {address} is not loaded")
+
+        if (history := coordinator.device.history) is None:
+            raise HomeAssistantError(f"Counter history is not enabled for {address}")
+
+        def _query() -> list[tuple[float, float, float]]:
+            history.flush()
+            return history.query(
+                dt_util.as_timestamp(start) if start is not None else 0,
+                dt_util.as_timestamp(end) if end is not None else float("inf"),
+                call.data[CONF_LIMIT],
+            )
+
+        records = await hass.async_add_executor_job(_query)
+
+        return {
+            "records": [
+                {
+                    "time": dt_util.utc_from_timestamp(timestamp).isoformat(),
+                    # Stored as float32, the device advertises two decimals
+                    "counter_a_value": None if math.isnan(counter_a) else round(counter_a, 2),
+                    "counter_b_value": None if math.isnan(counter_b) else round(counter_b, 2),
+                }
+                for timestamp, counter_a, counter_b in records
+            ],
+        }
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_HISTORY,
+        async_get_history,
+        schema=GET_HISTORY_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PROFILE,
+        async_profile,
+        schema=PROFILE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
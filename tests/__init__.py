@@ -0,0 +1,64 @@
+"""Tests for the Deembot aTick integration."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components import bluetooth
+from homeassistant.const import CONF_ADDRESS, CONF_PIN
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.deembot_atick.const import DOMAIN
+
+from .simulator import SimulatedATick
+
+ADDRESS = "AA:BB:CC:DD:EE:FF"
+PIN = "123456"
+
+
+async def async_setup_atick(
+    hass: HomeAssistant,
+    options: dict[str, Any] | None = None,
+) -> MockConfigEntry:
+    """Set up a config entry for the meter at ``ADDRESS``."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        unique_id=ADDRESS,
+        title="aTick",
+        data={CONF_ADDRESS: ADDRESS, CONF_PIN: PIN},
+        options=options or {},
+    )
+    entry.add_to_hass(hass)
+
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    return entry
+
+
+def inject_advertisement(
+    hass: HomeAssistant,
+    sim: SimulatedATick,
+    time: float,
+    source: str = "local",
+    connectable: bool = True,
+) -> None:
+    """Feed an advertisement of ``sim`` through the Bluetooth manager."""
+    advertisement = sim.advertisement()
+
+    bluetooth.async_get_advertisement_callback(hass)(
+        bluetooth.BluetoothServiceInfoBleak(
+            name=sim.name,
+            address=sim.address,
+            rssi=sim.rssi,
+            manufacturer_data=advertisement.manufacturer_data,
+            service_data=advertisement.service_data,
+            service_uuids=advertisement.service_uuids,
+            source=source,
+            device=sim.ble_device,
+            advertisement=advertisement,
+            connectable=connectable,
+            time=time,
+            tx_power=None,
+        )
+    )
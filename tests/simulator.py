@@ -0,0 +1,433 @@
+"""Offline aTick simulator for the tests.
+
+Serves the aTick GATT table and encrypted advertisements without any
+Bluetooth hardware, so the connection path of ``ATickBTDevice`` can be
+exercised (and load tested) on a plain Linux box::
+
+    backend = SimulatedBackend(seed=1)
+    sim = backend.add_device("AA:BB:CC:DD:EE:FF", pin="123456")
+    device = ATickBTDevice(
+        address=sim.address,
+        ble_device=sim.ble_device,
+        client_factory=backend.client,
+    )
+    await device.device_info_update()
+"""
+from __future__ import annotations
+
+import array
+import asyncio
+import dataclasses
+import logging
+import random
+import struct
+from typing import Any
+
+from bleak import AdvertisementData, BLEDevice
+from bleak.exc import BleakError
+
+from custom_components.deembot_atick.const import (DEFAULT_PIN_DEVICE,
+                                                   UUID_SERVICE_AG,
+                                                   UUID_ATTR_MODEL,
+                                                   UUID_ATTR_MANUFACTURER,
+                                                   UUID_ATTR_VERSION_FIRMWARE,
+                                                   UUID_AG_ATTR_PIN,
+                                                   UUID_AG_ATTR_OPTIONS,
+                                                   UUID_AG_ATTR_COMMAND,
+                                                   UUID_AG_ATTR_COUNTERS,
+                                                   UUID_AG_ATTR_MODE,
+                                                   UUID_AG_ATTR_VALUES,
+                                                   UUID_AG_ATTR_RATIOS)
+from custom_components.deembot_atick.device import ATickBTDevice
+
+_LOGGER = logging.getLogger(__name__)
+
+# Bluetooth SIG company identifier reserved for testing
+SIMULATED_MANUFACTURER_ID = 0xFFFF
+
+ADV_HEADER = 0x01
+ADV_FLAG_ENCRYPTED = 16
+
+
+@dataclasses.dataclass
+class SimulatedLinkProfile:
+    """Radio behaviour of a simulated device; latencies are in seconds."""
+
+    connect_latency: float = 0.5
+    # Seconds until a connection attempt times out, the client timeout if None
+    connect_timeout: float | None = None
+    gatt_latency: float = 0.05
+    jitter: float = 0.0
+    # Probability that a connection attempt never completes
+    connect_timeout_rate: float = 0.0
+    # Probability that a connection attempt is refused by the stack
+    connect_error_rate: float = 0.0
+    # Probability that the link drops during a GATT operation
+    disconnect_rate: float = 0.0
+
+
+@dataclasses.dataclass
+class SimulatorStats:
+    connect_attempts: int = 0
+    connects: int = 0
+    connect_timeouts: int = 0
+    connect_errors: int = 0
+    disconnects: int = 0
+    dropped_links: int = 0
+    reads: int = 0
+    writes: int = 0
+    active_connections: int = 0
+    max_active_connections: int = 0
+    connect_time_total: float = 0.0
+
+
+def _float_bytes(value: float) -> bytes:
+    return struct.pack('<f', value)
+
+
+def _wire_order(le_bytes: bytes) -> bytes:
+    """Inverse of ``ATickBTDevice.midLittleIndian``."""
+    return le_bytes[2:4] + le_bytes[0:2]
+
+
+def advertisement_key(pin: str, address: str) -> int:
+    """Return the single byte XOR key the device derives from its PIN and MAC."""
+    key = 0
+
+    for i in range(6):
+        key += int(address[i * 3:i * 3 + 2], 16)
+
+    for i in range(4):
+        key += (int(pin) >> (i * 8)) & 255
+
+    return ((key ^ 255) + 1) & 255
+
+
+def _raw_payload(counter_a: float, counter_b: float, key: int | None) -> bytes:
+    if key is None:
+        return bytes([ADV_HEADER]) + _float_bytes(counter_a) + _float_bytes(counter_b)
+
+    wire = _wire_order(_float_bytes(counter_a)) + _wire_order(_float_bytes(counter_b))
+
+    return bytes([ADV_HEADER | ADV_FLAG_ENCRYPTED]) + bytes(b ^ key for b in wire)
+
+
+def _float32_neighbours(value: float, span: int):
+    """Yield float32 values ordered by distance (in ulp) from ``value``."""
+    bits = struct.unpack('<I', _float_bytes(value))[0]
+
+    for distance in range(span + 1):
+        for candidate in {bits + distance, bits - distance}:
+            if 0 <= candidate <= 0x7F7FFFFF:
+                yield struct.unpack('<f', struct.pack('<I', candidate))[0]
+
+
+def build_manufacturer_data(
+    counter_a: float,
+    counter_b: float,
+    pin: str | None = DEFAULT_PIN_DEVICE,
+    address: str = "00:00:00:00:00:00",
+    encrypted: bool = True,
+) -> bytes:
+    """Build an aTick manufacturer data payload that decodes to the given counters.
+
+    The decoder detects encryption from a bit that overlaps counter B, so the
+    last bits of counter B are nudged (within its 0.01 resolution) until the
+    flag matches. Raises ValueError for readings the decoder cannot tell
+    apart from the other mode (most unencrypted ones, encrypted above ~4000).
+    """
+    pin = pin or DEFAULT_PIN_DEVICE
+    address = address.upper()
+    key = advertisement_key(pin, address) if encrypted else None
+    decoder = ATickBTDevice(address)
+
+    target = [ATickBTDevice.truncate_float(v, 2) for v in (counter_a, counter_b)]
+    # Aim for the middle of the 0.01 bucket, truncation then tolerates the nudge
+    value_a = next(
+        (v for v in _float32_neighbours(target[0] + 0.005, 64)
+         if ATickBTDevice.truncate_float(v, 2) == target[0]),
+        None,
+    )
+
+    if value_a is None:
+        raise ValueError(f"Counter value {counter_a} cannot be advertised")
+
+    for value_b in _float32_neighbours(target[1] + 0.005, 64):
+        payload = _raw_payload(value_a, value_b, key)
+
+        if decoder.is_encrypted(payload) != encrypted:
+            continue
+
+        if decoder.parseAdvValuesCounters(payload, pin, address) == target:
+            return payload
+
+    raise ValueError(f"Counter value {counter_b} cannot be advertised")
+
+
+class SimulatedCharacteristic:
+    def __init__(self, uuid: str, service: SimulatedService) -> None:
+        self.uuid = uuid.lower()
+        self.service_uuid = service.uuid
+
+    def __repr__(self) -> str:
+        return f"SimulatedCharacteristic({self.uuid})"
+
+
+class SimulatedService:
+    def __init__(self, uuid: str, characteristics: list[str]) -> None:
+        self.uuid = uuid.lower()
+        self.characteristics = [SimulatedCharacteristic(c, self) for c in characteristics]
+
+    def get_characteristic(self, uuid: str) -> SimulatedCharacteristic | None:
+        return next((c for c in self.characteristics if c.uuid == uuid.lower()), None)
+
+
+class SimulatedServiceCollection:
+    def __init__(self, services: list[SimulatedService]) -> None:
+        self.services = {service.uuid: service for service in services}
+
+    def get_service(self, uuid: str) -> SimulatedService | None:
+        return self.services.get(uuid.lower())
+
+
+class SimulatedATick:
+    """State of one simulated aTick, shared by every client connected to it."""
+
+    def __init__(
+        self,
+        backend: SimulatedBackend,
+        address: str,
+        name: str | None = None,
+        pin: str = DEFAULT_PIN_DEVICE,
+        counter_a_value: float = 0.0,
+        counter_b_value: float = 0.0,
+        link: SimulatedLinkProfile | None = None,
+    ) -> None:
+        self.backend = backend
+        self.address = address.upper()
+        self.name = name or f"aTick_{self.address.replace(':', '')[-4:]}"
+        self.pin = pin
+        self.link = link or SimulatedLinkProfile()
+        self.encrypted = True
+        self.rssi = -70
+        self.ble_device = BLEDevice(self.address, self.name, {"simulated": True})
+
+        self.counter_a_value = counter_a_value
+        self.counter_b_value = counter_b_value
+        self.counter_a_ratio = 0.01
+        self.counter_b_ratio = 0.01
+
+        # The firmware serves the device information characteristics from the
+        # AG service too, which is what ATickBTDevice.read_gatt relies on
+        self.services = SimulatedServiceCollection([
+            SimulatedService(UUID_SERVICE_AG, [
+                UUID_ATTR_MODEL,
+                UUID_ATTR_MANUFACTURER,
+                UUID_ATTR_VERSION_FIRMWARE,
+                UUID_AG_ATTR_PIN,
+                UUID_AG_ATTR_OPTIONS,
+                UUID_AG_ATTR_COMMAND,
+                UUID_AG_ATTR_COUNTERS,
+                UUID_AG_ATTR_MODE,
+                UUID_AG_ATTR_VALUES,
+                UUID_AG_ATTR_RATIOS,
+            ]),
+        ])
+        self.storage: dict[str, bytes] = {
+            UUID_ATTR_MODEL.lower(): b"aTick",
+            UUID_ATTR_MANUFACTURER.lower(): b"Deembot",
+            UUID_ATTR_VERSION_FIRMWARE.lower(): b"1.0.0-sim",
+            UUID_AG_ATTR_OPTIONS.lower(): bytes(4),
+            UUID_AG_ATTR_MODE.lower(): bytes(1),
+            UUID_AG_ATTR_COUNTERS.lower(): bytes(8),
+        }
+
+    def add_consumption(self, counter_a: float = 0.0, counter_b: float = 0.0) -> None:
+        self.counter_a_value += counter_a
+        self.counter_b_value += counter_b
+
+    def manufacturer_data(self) -> bytes:
+        return build_manufacturer_data(
+            self.counter_a_value,
+            self.counter_b_value,
+            self.pin,
+            self.address,
+            self.encrypted,
+        )
+
+    def advertisement(self) -> AdvertisementData:
+        return AdvertisementData(
+            local_name=self.name,
+            manufacturer_data={SIMULATED_MANUFACTURER_ID: self.manufacturer_data()},
+            service_data={},
+            service_uuids=[UUID_SERVICE_AG.lower()],
+            tx_power=None,
+            rssi=self.rssi,
+            platform_data=(),
+        )
+
+    def read(self, uuid: str) -> bytes:
+        uuid = uuid.lower()
+
+        if uuid == UUID_AG_ATTR_VALUES.lower():
+            return array.array('f', [self.counter_a_value, self.counter_b_value]).tobytes()
+
+        if uuid == UUID_AG_ATTR_RATIOS.lower():
+            return array.array('f', [self.counter_a_ratio, self.counter_b_ratio]).tobytes()
+
+        if uuid not in self.storage:
+            raise BleakError(f"Characteristic {uuid} is not readable")
+
+        return self.storage[uuid]
+
+    def write(self, uuid: str, data: bytes) -> None:
+        uuid = uuid.lower()
+
+        if uuid == UUID_AG_ATTR_PIN.lower():
+            self.pin = str(int.from_bytes(data, 'little'))
+
+        self.storage[uuid] = bytes(data)
+
+
+class SimulatedBleakClient:
+    """Stand-in for ``BleakClient`` backed by a ``SimulatedATick``."""
+
+    def __init__(self, backend: SimulatedBackend, ble_device: BLEDevice, timeout: float = 10.0) -> None:
+        self._backend = backend
+        self._device = backend.devices[ble_device.address.upper()]
+        self._timeout = timeout
+        self._connected = False
+
+    @property
+    def address(self) -> str:
+        return self._device.address
+
+    @property
+    def is_connected(self) -> bool:
+        return self._connected
+
+    @property
+    def services(self) -> SimulatedServiceCollection:
+        if not self._connected:
+            raise BleakError("Service Discovery has not been performed yet")
+
+        return self._device.services
+
+    async def __aenter__(self) -> SimulatedBleakClient:
+        await self.connect()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.disconnect()
+
+    async def connect(self, **kwargs: Any) -> bool:
+        link = self._device.link
+        stats = self._backend.stats
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        stats.connect_attempts += 1
+
+        try:
+            if self._backend.rng.random() < link.connect_timeout_rate:
+                await asyncio.sleep(
+                    link.connect_timeout if link.connect_timeout is not None else self._timeout
+                )
+                stats.connect_timeouts += 1
+                raise asyncio.TimeoutError(f"Connection to {self.address} timed out")
+
+            await asyncio.sleep(self._backend.latency(link.connect_latency, link))
+
+            if (
+                stats.active_connections >= self._backend.max_connections
+                or self._backend.rng.random() < link.connect_error_rate
+            ):
+                stats.connect_errors += 1
+                raise BleakError(f"Failed to connect to {self.address}")
+        finally:
+            stats.connect_time_total += loop.time() - started
+
+        self._connected = True
+        stats.connects += 1
+        stats.active_connections += 1
+        stats.max_active_connections = max(stats.max_active_connections, stats.active_connections)
+
+        _LOGGER.debug("Simulated connect to %s", self.address)
+
+        return True
+
+    async def disconnect(self) -> bool:
+        if self._connected:
+            self._drop()
+            self._backend.stats.disconnects += 1
+
+        return True
+
+    def _drop(self) -> None:
+        self._connected = False
+        self._backend.stats.active_connections -= 1
+
+    async def _gatt_operation(self) -> None:
+        if not self._connected:
+            raise BleakError("Not connected")
+
+        link = self._device.link
+        await asyncio.sleep(self._backend.latency(link.gatt_latency, link))
+
+        if self._backend.rng.random() < link.disconnect_rate:
+            self._drop()
+            self._backend.stats.dropped_links += 1
+            raise BleakError(f"{self.address}: Disconnected during GATT operation")
+
+    async def read_gatt_char(self, char_specifier: SimulatedCharacteristic | str, **kwargs: Any) -> bytearray:
+        await self._gatt_operation()
+        self._backend.stats.reads += 1
+
+        return bytearray(self._device.read(self._char_uuid(char_specifier)))
+
+    async def write_gatt_char(
+        self,
+        char_specifier: SimulatedCharacteristic | str,
+        data: bytes | bytearray,
+        response: bool = False,
+    ) -> None:
+        await self._gatt_operation()
+        self._backend.stats.writes += 1
+
+        self._device.write(self._char_uuid(char_specifier), bytes(data))
+
+    @staticmethod
+    def _char_uuid(char_specifier: SimulatedCharacteristic | str | None) -> str:
+        if char_specifier is None:
+            raise BleakError("Characteristic None was not found")
+
+        if isinstance(char_specifier, SimulatedCharacteristic):
+            return char_specifier.uuid
+
+        return char_specifier
+
+
+class SimulatedBackend:
+    """Registry of simulated devices acting as a Bleak backend."""
+
+    def __init__(self, seed: int | None = None, max_connections: int = 3) -> None:
+        self.rng = random.Random(seed)
+        # Concurrent connections the simulated adapter accepts
+        self.max_connections = max_connections
+        self.devices: dict[str, SimulatedATick] = {}
+        self.stats = SimulatorStats()
+
+    def add_device(self, address: str, **kwargs: Any) -> SimulatedATick:
+        device = SimulatedATick(self, address, **kwargs)
+        self.devices[device.address] = device
+
+        return device
+
+    def client(self, ble_device: BLEDevice, timeout: float = 10.0, **kwargs: Any) -> SimulatedBleakClient:
+        """Client factory with the ``BleakClient`` signature, see ``ATickBTDevice``."""
+        return SimulatedBleakClient(self, ble_device, timeout)
+
+    def latency(self, base: float, link: SimulatedLinkProfile) -> float:
+        if not link.jitter:
+            return base
+
+        return max(0.0, self.rng.gauss(base, link.jitter))
@@ -0,0 +1,199 @@
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from homeassistant.components.recorder import Recorder
+from homeassistant.components.recorder.models import StatisticData, StatisticMeanType, StatisticMetaData
+from homeassistant.components.recorder.statistics import async_import_statistics, statistics_during_period
+from homeassistant.const import CONF_PATH, UnitOfVolume
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import entity_registry as er
+from homeassistant.util.unit_conversion import VolumeConverter
+from pytest_homeassistant_custom_component.components.recorder.common import async_wait_recording_done
+
+from custom_components.deembot_atick import backfill
+from custom_components.deembot_atick.backfill import CaptureSummary, iter_capture_hours
+from custom_components.deembot_atick.const import DOMAIN
+from custom_components.deembot_atick.device import ATickBTDevice
+
+from . import ADDRESS, PIN, async_setup_atick
+from .simulator import build_manufacturer_data
+
+HOUR = timedelta(hours=1)
+START = datetime(2024, 5, 1, 10, tzinfo=timezone.utc)
+
+
+def _line(timestamp: float, counter_a: float, counter_b: float) -> str:
+    payload = build_manufacturer_data(counter_a, counter_b, PIN, ADDRESS).hex()
+    return f"{timestamp},{ADDRESS},{payload}\n"
+
+
+def _capture(path: Path, readings: list[tuple[datetime, float]]) -> str:
+    path.write_text("".join(_line((start + timedelta(minutes=5)).timestamp(), value, 1.0) for start, value in readings))
+    return str(path)
+
+
+def test_iter_capture_hours_streams_last_reading_per_hour(tmp_path: Path) -> None:
+    start = START.timestamp()
+    capture = tmp_path / "capture.csv"
+    capture.write_text(
+        "# timestamp,address,manufacturer data\n"
+        + _line(start + 60, 1.0, 2.0)
+        + _line(start + 1800, 1.1, 2.0)
+        + "garbage\n"
+        + _line(start + 3600 + 5, 1.2, 2.1)
+        + _line(start + 60, 0.5, 0.5)
+        + _line(start + 3 * 3600, 1.5, 2.5)
+    )
+    device = ATickBTDevice(ADDRESS)
+    summary = CaptureSummary()
+
+    hours = iter_capture_hours(
+        str(capture),
+        {ADDRESS: lambda data: device.parse_manufacturer_data(PIN, data)},
+        summary,
+    )
+
+    # The first hour is yielded as soon as the next hour starts
+    address, first = next(hours)
+    assert address == ADDRESS
+    assert first.start == START
+    assert (first.counter_a_value, first.counter_b_value) == (1.1, 2.0)
+    assert summary.lines == 4
+
+    rest = [reading for _, reading in hours]
+    assert [reading.start.hour for reading in rest] == [11, 13]
+    assert rest[-1].counter_a_value == 1.5
+    # The garbage line and the out of order reading
+    assert summary.skipped == 2
+    assert summary.lines == 6
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(recorder_mock: Recorder, enable_custom_integrations: None) -> None:
+    """Start the recorder before Home Assistant, as it requires."""
+
+
+@pytest.fixture
+async def statistic_id(hass: HomeAssistant, mock_bluetooth: None, tmp_path: Path) -> str:
+    """Set up the meter and return the statistic id of its counter A."""
+    hass.config.allowlist_external_dirs = {str(tmp_path)}
+    entry = await async_setup_atick(hass)
+
+    return er.async_get(hass).async_get_entity_id(
+        "sensor", DOMAIN, f"{entry.runtime_data.device.base_unique_id}-counter_a_value"
+    )
+
+
+def _add_statistics(hass: HomeAssistant, statistic_id: str, rows: list[tuple[datetime, float, float]]) -> None:
+    async_import_statistics(
+        hass,
+        StatisticMetaData(
+            mean_type=StatisticMeanType.NONE,
+            has_sum=True,
+            name=None,
+            source="recorder",
+            statistic_id=statistic_id,
+            unit_class=VolumeConverter.UNIT_CLASS,
+            unit_of_measurement=UnitOfVolume.CUBIC_METERS,
+        ),
+        [StatisticData(start=start, state=state, sum=total) for start, state, total in rows],
+    )
+
+
+async def _import(hass: HomeAssistant, path: str) -> dict:
+    response = await hass.services.async_call(
+        DOMAIN, "import_history", {CONF_PATH: path}, blocking=True, return_response=True
+    )
+    await async_wait_recording_done(hass)
+
+    return response
+
+
+async def _statistics(hass: HomeAssistant, statistic_id: str) -> dict[datetime, tuple[float, float]]:
+    rows = await hass.async_add_executor_job(
+        statistics_during_period,
+        hass,
+        START - 50 * 24 * HOUR,
+        START + 50 * 24 * HOUR,
+        {statistic_id},
+        "hour",
+        None,
+        {"state", "sum"},
+    )
+
+    return {
+        datetime.fromtimestamp(row["start"], timezone.utc): (row["state"], pytest.approx(row["sum"]))
+        for row in rows.get(statistic_id, [])
+    }
+
+
+async def test_import_between_existing_rows(hass: HomeAssistant, statistic_id: str, tmp_path: Path) -> None:
+    _add_statistics(hass, statistic_id, [(START, 10.0, 100.0), (START + 5 * HOUR, 15.0, 105.0)])
+    await async_wait_recording_done(hass)
+
+    response = await _import(hass, _capture(tmp_path / "capture.csv", [
+        # Already compiled by the recorder, stays untouched
+        (START, 10.2),
+        (START + HOUR, 11.0),
+        (START + 2 * HOUR, 12.0),
+        # The meter was reset
+        (START + 3 * HOUR, 0.5),
+    ]))
+
+    assert response["imported"][statistic_id] == 3
+    assert await _statistics(hass, statistic_id) == {
+        START: (10.0, 100.0),
+        START + HOUR: (11.0, 101.0),
+        START + 2 * HOUR: (12.0, 102.0),
+        START + 3 * HOUR: (0.5, 102.5),
+        START + 5 * HOUR: (15.0, 105.0),
+    }
+
+
+async def test_import_before_first_existing_row(hass: HomeAssistant, statistic_id: str, tmp_path: Path) -> None:
+    _add_statistics(hass, statistic_id, [(START + 10 * HOUR, 20.0, 50.0)])
+    await async_wait_recording_done(hass)
+
+    await _import(hass, _capture(tmp_path / "capture.csv", [
+        (START + 7 * HOUR, 18.0),
+        (START + 8 * HOUR, 19.0),
+    ]))
+
+    # Counted back from the existing row, so its sum stays consistent
+    assert await _statistics(hass, statistic_id) == {
+        START + 7 * HOUR: (18.0, 48.0),
+        START + 8 * HOUR: (19.0, 49.0),
+        START + 10 * HOUR: (20.0, 50.0),
+    }
+
+
+async def test_import_without_anchor_in_lookback(hass: HomeAssistant, statistic_id: str, tmp_path: Path) -> None:
+    _add_statistics(hass, statistic_id, [(START + 40 * 24 * HOUR, 20.0, 50.0)])
+    await async_wait_recording_done(hass)
+
+    with pytest.raises(HomeAssistantError, match="to continue the sum from"):
+        await _import(hass, _capture(tmp_path / "capture.csv", [(START, 18.0)]))
+
+
+async def test_import_spans_batches(hass: HomeAssistant, statistic_id: str, tmp_path: Path) -> None:
+    values = [1.0, 2.0, 3.0, 5.0, 6.0]
+    path = _capture(tmp_path / "capture.csv", [(START + index * HOUR, value) for index, value in enumerate(values)])
+
+    with (
+        patch.object(backfill, "BACKFILL_BATCH_SIZE", 2),
+        patch.object(backfill, "async_import_statistics", wraps=backfill.async_import_statistics) as import_statistics,
+    ):
+        response = await _import(hass, path)
+
+    # Three batches for each of the two counters
+    assert import_statistics.call_count == 6
+    assert response["imported"][statistic_id] == 5
+    # The running state and sum carry over from one batch to the next
+    assert await _statistics(hass, statistic_id) == {
+        START + index * HOUR: (value, total)
+        for index, (value, total) in enumerate(zip(values, [0.0, 1.0, 2.0, 4.0, 5.0]))
+    }
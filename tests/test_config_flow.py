@@ -0,0 +1,42 @@
+from homeassistant.const import CONF_ADDRESS, CONF_PIN
+from homeassistant.core import HomeAssistant
+from homeassistant.data_entry_flow import FlowResultType
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.deembot_atick.const import (
+    CONF_ACTIVE_POLL_INTERVAL,
+    CONF_HISTORY,
+    CONF_HISTORY_RETENTION_DAYS,
+    CONF_PRESENCE_INTERVAL_FACTOR,
+    CONF_PRESENCE_MIN_TIMEOUT,
+    DOMAIN,
+)
+
+ADDRESS = "AA:BB:CC:DD:EE:FF"
+
+
+async def test_options_flow(hass: HomeAssistant) -> None:
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        unique_id=ADDRESS,
+        title="aTick",
+        data={CONF_ADDRESS: ADDRESS, CONF_PIN: "123456"},
+    )
+    entry.add_to_hass(hass)
+
+    result = await hass.config_entries.options.async_init(entry.entry_id)
+
+    assert result["type"] is FlowResultType.FORM
+    assert result["step_id"] == "init"
+
+    options = {
+        CONF_ACTIVE_POLL_INTERVAL: 12,
+        CONF_PRESENCE_INTERVAL_FACTOR: 4.0,
+        CONF_PRESENCE_MIN_TIMEOUT: 120,
+        CONF_HISTORY: True,
+        CONF_HISTORY_RETENTION_DAYS: 90,
+    }
+    result = await hass.config_entries.options.async_configure(result["flow_id"], user_input=options)
+
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    assert entry.options == options
@@ -0,0 +1,114 @@
+import asyncio
+
+import pytest
+
+from custom_components.deembot_atick.const import SOURCE_ADVERTISEMENT
+from custom_components.deembot_atick.device import ATickBTDevice, ATickParsedAdvertisementData
+
+from .simulator import SimulatedBackend, SimulatedLinkProfile, build_manufacturer_data
+
+ADDRESS = "AA:BB:CC:DD:EE:FF"
+FAST_LINK = SimulatedLinkProfile(connect_latency=0.01, gatt_latency=0.001)
+
+
+def _device(backend: SimulatedBackend, address: str = ADDRESS, **kwargs) -> ATickBTDevice:
+    sim = backend.add_device(address, link=kwargs.pop("link", FAST_LINK), **kwargs)
+
+    return ATickBTDevice(
+        address=sim.address,
+        ble_device=sim.ble_device,
+        client_factory=backend.client,
+    )
+
+
+async def test_device_info_update() -> None:
+    backend = SimulatedBackend(seed=1)
+    device = _device(backend)
+
+    await device.device_info_update()
+    await device.stop()
+
+    assert device.model == "aTick"
+    assert device.manufacturer == "Deembot"
+    assert device.firmware_version == "1.0.0-sim"
+    assert backend.stats.connects == 1
+    assert backend.stats.reads == 3
+    assert backend.stats.active_connections == 0
+
+
+@pytest.mark.parametrize("pin", ["1234", "123456", "87654321"])
+async def test_parse_advertisement_data(pin: str) -> None:
+    backend = SimulatedBackend(seed=1)
+    sim = backend.add_device(ADDRESS, pin=pin, counter_a_value=123.45, counter_b_value=67.89)
+    device = ATickBTDevice(ADDRESS)
+
+    parsed = device.parse_advertisement_data(pin, sim.advertisement())
+
+    assert parsed.counter_a_value == 123.45
+    assert parsed.counter_b_value == 67.89
+    assert device.is_advertisement_changed(parsed)
+
+
+def test_build_manufacturer_data_is_encrypted() -> None:
+    payload = build_manufacturer_data(10.5, 0.25, "123456", ADDRESS)
+
+    assert ATickBTDevice.is_encrypted(payload)
+    assert ATickBTDevice(ADDRESS).parseAdvValuesCounters(payload, "123456", ADDRESS) == [10.5, 0.25]
+
+
+async def test_get_client_maps_connect_error() -> None:
+    backend = SimulatedBackend(seed=1)
+    device = _device(backend, link=SimulatedLinkProfile(connect_latency=0.01, connect_error_rate=1))
+
+    with pytest.raises(asyncio.TimeoutError, match="Error on connect"):
+        await device.device_info_update()
+
+    assert backend.stats.connect_errors == 1
+
+
+async def test_get_client_maps_connect_timeout() -> None:
+    backend = SimulatedBackend(seed=1)
+    device = _device(backend, link=SimulatedLinkProfile(connect_timeout=0.01, connect_timeout_rate=1))
+
+    with pytest.raises(asyncio.TimeoutError, match="Timeout on connect"):
+        await device.device_info_update()
+
+    assert backend.stats.connect_timeouts == 1
+
+
+async def test_connect_storm_limited_by_adapter() -> None:
+    backend = SimulatedBackend(seed=1, max_connections=2)
+    devices = [
+        _device(backend, f"AA:BB:CC:DD:EE:{index:02X}")
+        for index in range(5)
+    ]
+
+    results = await asyncio.gather(
+        *(device.device_info_update() for device in devices),
+        return_exceptions=True,
+    )
+    await asyncio.gather(*(device.stop() for device in devices))
+
+    failures = [result for result in results if isinstance(result, asyncio.TimeoutError)]
+
+    assert len(failures) == 3
+    assert backend.stats.connects == 2
+    assert backend.stats.max_active_connections == 2
+    assert backend.stats.active_connections == 0
+
+
+def test_last_updated_only_advances_on_change() -> None:
+    device = ATickBTDevice(ADDRESS)
+
+    device.update_from_advertisement(ATickParsedAdvertisementData(1.5, 2.5))
+    updated = device.last_updated
+
+    assert updated is not None
+    assert device.last_source == SOURCE_ADVERTISEMENT
+
+    # Forced re-apply of the same reading after the device was unavailable
+    device.update_from_advertisement(ATickParsedAdvertisementData(1.5, 2.5))
+    assert device.last_updated is updated
+
+    device.update_from_advertisement(ATickParsedAdvertisementData(1.5, 2.6))
+    assert device.last_updated is not updated
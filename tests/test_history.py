@@ -0,0 +1,108 @@
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.deembot_atick import history
+from custom_components.deembot_atick.const import CONF_HISTORY
+from custom_components.deembot_atick.device import ATickBTDevice, ATickParsedAdvertisementData
+from custom_components.deembot_atick.history import HistoryStore
+
+from . import async_setup_atick
+
+
+@pytest.fixture
+def small_segments(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(history, "SEGMENT_RECORDS", 10)
+
+
+def _fill(store: HistoryStore, start: float, count: int, step: float = 60) -> None:
+    for index in range(count):
+        store.append(start + index * step, index / 100, None)
+
+    store.flush()
+
+
+def test_flush_rotates_segments_and_query_ranges(tmp_path: Path, small_segments: None) -> None:
+    store = HistoryStore(str(tmp_path), retention_days=365)
+    start = time.time() - 3600
+    _fill(store, start, 35)
+
+    assert len(os.listdir(tmp_path)) == 4
+
+    records = store.query(start + 60 * 12, start + 60 * 15)
+    assert [record[0] for record in records] == [start + 60 * minute for minute in (12, 13, 14)]
+    assert records[0][1] == pytest.approx(0.12)
+    assert records[0][2] != records[0][2]  # missing counter B is stored as NaN
+
+    assert len(store.query(0, float("inf"), limit=5)) == 5
+
+
+def test_flush_skips_records_out_of_order(tmp_path: Path) -> None:
+    store = HistoryStore(str(tmp_path), retention_days=365)
+    now = time.time()
+    store.append(now, 1, 1)
+    store.append(now - 10, 2, 2)
+    store.flush()
+
+    # A new store continues after the records already on disk
+    reopened = HistoryStore(str(tmp_path), retention_days=365)
+    reopened.append(now - 5, 3, 3)
+
+    assert reopened.flush() == 0
+    assert len(reopened.query(0, float("inf"))) == 1
+
+
+def test_compact_drops_only_whole_expired_segments(tmp_path: Path, small_segments: None) -> None:
+    store = HistoryStore(str(tmp_path), retention_days=1)
+    now = time.time()
+    start = now - 86400 - 60 * 15 + 30
+    _fill(store, start, 25)
+    segments = sorted(os.listdir(tmp_path))
+
+    store.compact(now)
+
+    # The first segment fully expired, the second one only partially
+    assert sorted(os.listdir(tmp_path)) == segments[1:]
+    records = store.query(0, float("inf"))
+    assert all(record[0] >= now - 86400 for record in records)
+    assert len(records) == 25 - 15
+
+
+def test_device_appends_history_only_on_change(tmp_path: Path) -> None:
+    device = ATickBTDevice("AA:BB:CC:DD:EE:FF")
+    device.history = HistoryStore(str(tmp_path), retention_days=365)
+
+    device.update_from_advertisement(ATickParsedAdvertisementData(1.5, 2.5))
+    device.update_from_advertisement(ATickParsedAdvertisementData(1.5, 2.5))
+    device.update_from_advertisement(ATickParsedAdvertisementData(1.5, 2.6))
+
+    assert device.history.flush() == 2
+
+
+async def test_one_store_per_device(hass: HomeAssistant, mock_bluetooth: None, tmp_path: Path) -> None:
+    hass.config.config_dir = str(tmp_path)
+    entry = await async_setup_atick(hass, {CONF_HISTORY: True})
+    store = entry.runtime_data.device.history
+    store.append(time.time(), 1.5, 2.5)
+
+    # Turning history off flushes in the background, the flush must share
+    # its lock with whatever store is used next for the same files
+    hass.config_entries.async_update_entry(entry, options={CONF_HISTORY: False})
+    await hass.async_block_till_done()
+    assert entry.runtime_data.device.history is None
+
+    hass.config_entries.async_update_entry(entry, options={CONF_HISTORY: True})
+    await hass.async_block_till_done()
+    assert entry.runtime_data.device.history is store
+
+    assert await hass.config_entries.async_reload(entry.entry_id)
+    await hass.async_block_till_done()
+    assert entry.runtime_data.device.history is store
+
+    assert len(await hass.async_add_executor_job(store.query, 0, float("inf"))) == 1
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
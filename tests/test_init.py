@@ -0,0 +1,86 @@
+from unittest.mock import AsyncMock, patch
+
+from homeassistant.components import bluetooth
+from homeassistant.const import CONF_PIN
+from homeassistant.core import HomeAssistant
+from homeassistant.data_entry_flow import FlowResultType
+from homeassistant.helpers import entity_registry as er
+
+from custom_components.deembot_atick.const import (
+    CONF_ACTIVE_POLL_INTERVAL,
+    CONF_HISTORY,
+    CONF_HISTORY_RETENTION_DAYS,
+    CONF_PRESENCE_INTERVAL_FACTOR,
+    CONF_PRESENCE_MIN_TIMEOUT,
+    DOMAIN,
+)
+from custom_components.deembot_atick.device import ATickBTDevice
+
+from . import ADDRESS, async_setup_atick, inject_advertisement
+from .simulator import SimulatedBackend
+
+NEW_PIN = "654321"
+
+
+async def test_pin_change_applied_without_reload(hass: HomeAssistant, mock_bluetooth: None) -> None:
+    # The meter was re-paired with a new PIN, its advertisements use the new key
+    sim = SimulatedBackend(seed=1).add_device(ADDRESS, pin=NEW_PIN, counter_a_value=12.34, counter_b_value=5.6)
+
+    with patch.object(ATickBTDevice, "active_full_update", AsyncMock()) as active_full_update:
+        entry = await async_setup_atick(hass)
+        coordinator = entry.runtime_data
+        entity_id = er.async_get(hass).async_get_entity_id(
+            "sensor", DOMAIN, f"{coordinator.device.base_unique_id}-counter_a_value"
+        )
+
+        inject_advertisement(hass, sim, bluetooth.MONOTONIC_TIME())
+        await hass.async_block_till_done()
+
+        assert active_full_update.await_count == 1
+        assert hass.states.get(entity_id).state != "12.34"
+
+        with patch.object(hass.config_entries, "async_reload", wraps=hass.config_entries.async_reload) as reload:
+            result = await entry.start_reconfigure_flow(hass)
+            result = await hass.config_entries.flow.async_configure(result["flow_id"], {CONF_PIN: NEW_PIN})
+            await hass.async_block_till_done()
+
+        assert result["type"] is FlowResultType.ABORT
+        assert result["reason"] == "reconfigure_successful"
+        assert entry.data[CONF_PIN] == NEW_PIN
+
+        # The last advertisement is decoded again with the new key
+        assert hass.states.get(entity_id).state == "12.34"
+
+        # Same coordinator and entities, and the meter was not connected again
+        reload.assert_not_called()
+        assert entry.runtime_data is coordinator
+        assert coordinator.pin == NEW_PIN
+        assert active_full_update.await_count == 1
+
+        assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_options_applied_without_reload(hass: HomeAssistant, mock_bluetooth: None) -> None:
+    entry = await async_setup_atick(hass)
+    coordinator = entry.runtime_data
+
+    with patch.object(hass.config_entries, "async_reload", wraps=hass.config_entries.async_reload) as reload:
+        result = await hass.config_entries.options.async_init(entry.entry_id)
+        result = await hass.config_entries.options.async_configure(result["flow_id"], user_input={
+            CONF_ACTIVE_POLL_INTERVAL: 12,
+            CONF_PRESENCE_INTERVAL_FACTOR: 4.0,
+            CONF_PRESENCE_MIN_TIMEOUT: 120,
+            CONF_HISTORY: False,
+            CONF_HISTORY_RETENTION_DAYS: 90,
+        })
+        await hass.async_block_till_done()
+
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+
+    reload.assert_not_called()
+    assert entry.runtime_data is coordinator
+    assert coordinator.device.active_poll_interval == 12 * 3600
+    assert coordinator.presence.factor == 4.0
+    assert coordinator.presence.min_timeout == 120
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
@@ -0,0 +1,102 @@
+from unittest.mock import patch
+
+from homeassistant.components import bluetooth
+from homeassistant.const import CONF_ADDRESS, CONF_PIN, STATE_UNAVAILABLE
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.deembot_atick.const import DOMAIN
+from custom_components.deembot_atick.device import ATickBTDevice
+from custom_components.deembot_atick.presence import AdvertisementPresence
+
+from . import inject_advertisement
+from .simulator import SimulatedBackend
+
+ADDRESS = "AA:BB:CC:DD:EE:FF"
+PIN = "123456"
+
+
+def test_no_timeout_until_interval_known() -> None:
+    presence = AdvertisementPresence()
+
+    for second in range(0, 300, 30):
+        presence.touch(float(second))
+
+    assert presence.timeout is None
+    assert presence.gap(300.0) == 30.0
+    assert not presence.is_stale(10_000.0)
+
+
+def test_stale_after_multiple_of_interval() -> None:
+    presence = AdvertisementPresence(factor=3, min_timeout=10)
+    presence.interval = 20.0
+    presence.touch(100.0)
+    # Older sightings never move last_seen back
+    presence.touch(50.0)
+
+    assert presence.timeout == 60.0
+    assert not presence.is_stale(155.0)
+    assert presence.is_stale(165.0)
+
+    presence.interval = 2.0
+    assert presence.timeout == 10.0
+
+
+async def test_presence_from_repeated_advertisements(hass: HomeAssistant, mock_bluetooth: None) -> None:
+    backend = SimulatedBackend(seed=1)
+    sim = backend.add_device(ADDRESS, pin=PIN, counter_a_value=1.5, counter_b_value=2.5)
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        unique_id=ADDRESS,
+        title="aTick",
+        data={CONF_ADDRESS: ADDRESS, CONF_PIN: PIN},
+    )
+    entry.add_to_hass(hass)
+
+    with patch.object(ATickBTDevice, "active_poll_needed", return_value=False):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+        coordinator = entry.runtime_data
+        entity_id = er.async_get(hass).async_get_entity_id(
+            "sensor", DOMAIN, f"{coordinator.device.base_unique_id}-counter_a_value"
+        )
+        now = bluetooth.MONOTONIC_TIME()
+
+        with patch.object(
+            coordinator.device, "parse_advertisement_data", wraps=coordinator.device.parse_advertisement_data
+        ) as parse:
+            # A meter without consumption repeats the same payload every 5 s
+            for step in range(20):
+                inject_advertisement(hass, sim, now - 100 + step * 5)
+
+            await hass.async_block_till_done()
+
+        # Only the first one reaches the coordinator callback
+        assert parse.call_count == 1
+
+        coordinator._async_check_presence(dt_util.utcnow())
+        await hass.async_block_till_done()
+
+        assert coordinator.presence.interval == 5.0
+        assert coordinator.presence.timeout == 60
+        assert hass.states.get(entity_id).state == "1.5"
+
+        with patch("homeassistant.components.bluetooth.MONOTONIC_TIME", return_value=now + 60):
+            coordinator._async_check_presence(dt_util.utcnow())
+            await hass.async_block_till_done()
+
+        assert hass.states.get(entity_id).state == STATE_UNAVAILABLE
+
+        # The same payload again brings the meter back
+        inject_advertisement(hass, sim, now + 61)
+
+        with patch("homeassistant.components.bluetooth.MONOTONIC_TIME", return_value=now + 62):
+            coordinator._async_check_presence(dt_util.utcnow())
+            await hass.async_block_till_done()
+
+        assert hass.states.get(entity_id).state == "1.5"
+
+        assert await hass.config_entries.async_unload(entry.entry_id)
@@ -0,0 +1,50 @@
+import asyncio
+
+from custom_components.deembot_atick import profiler
+
+
+@profiler.profiled
+def _work(count: int) -> int:
+    return sum(range(count))
+
+
+@profiler.profiled
+async def _slow_work(event: asyncio.Event) -> int:
+    _work(10)
+    await event.wait()
+    return _work(20)
+
+
+async def test_profiled_calls_are_recorded() -> None:
+    session = profiler.start()
+
+    try:
+        assert _work(10) == 45
+        assert await _slow_work(_set_event()) == 190
+    finally:
+        assert profiler.stop() is session
+
+    # _work three times and a single step of _slow_work, the event is set
+    assert session.calls == 4
+    assert not profiler.is_running()
+
+
+async def test_coroutine_outliving_session_is_not_profiled() -> None:
+    event = asyncio.Event()
+    session = profiler.start()
+    task = asyncio.create_task(_slow_work(event))
+    await asyncio.sleep(0)
+
+    profiler.stop()
+    calls = session.calls
+    event.set()
+
+    assert await task == 190
+    assert session.closed
+    assert session.calls == calls
+
+
+def _set_event() -> asyncio.Event:
+    event = asyncio.Event()
+    event.set()
+    return event